@@ -1,140 +1,223 @@
 #!/usr/bin/env python3
-import subprocess
+import asyncio
 import json
 import re
 import requests
-import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+import aiocoap
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    json_loads = json.loads
 
 # ---------- CONFIG ----------
 NODE_ADDR = "[fd12:3456::92fd:9fff:feee:9d4b]"
 COAP_PORT = 5683
 THINGSPEAK_API_KEY = "API" # Replace with ThingSpeak API key
 UPDATE_INTERVAL = 30  # seconds
+MAX_BACKOFF = 300  # seconds; cap for the delay after repeated failures
+THINGSPEAK_URL = "https://api.thingspeak.com/update"
+
+# ---------- HTTP SESSION ----------
+# One keep-alive session for all uploads so each POST reuses the TLS
+# connection to ThingSpeak instead of doing a fresh handshake every loop.
+SESSION = requests.Session()
+SESSION.mount(
+    "https://",
+    HTTPAdapter(pool_connections=1, pool_maxsize=1,
+                max_retries=Retry(total=3, backoff_factor=0.5)),
+)
+SESSION.headers.update({"User-Agent": "wisun-coap-bridge/1.0", "Connection": "keep-alive"})
+# The upload URL and headers never change, so prepare the request once and
+# only swap in a new form body each iteration.
+THINGSPEAK_REQUEST = SESSION.prepare_request(requests.Request("POST", THINGSPEAK_URL))
+# Session.send skips the environment lookup Session.request does, so resolve
+# the proxies, CA bundle and verify settings (HTTPS_PROXY, NO_PROXY,
+# REQUESTS_CA_BUNDLE, ...) once here and pass them to every send.
+THINGSPEAK_SEND_SETTINGS = SESSION.merge_environment_settings(THINGSPEAK_URL, {}, None, None, None)
+
+# ---------- PATTERNS ----------
+# Matched against raw CoAP payload bytes, so no decode is needed
+TIME_RE = re.compile(rb"(\d+)-(\d+):(\d+):(\d+)")
+# The neighbor payload is a bare key/value list (no braces, unquoted tag),
+# so it is not valid JSON; pick the fields out in a single scan instead.
+NEIGHBOR_FIELD_RE = re.compile(rb'"(rsl_in|rsl_out|rpl_rank)":\s*(-?\d+)')
+
+# /status/all already reports the parent link and the disconnected time, so
+# the dedicated endpoints are only queried when these keys are missing or
+# null. Its connected_total leaves out the current session, so the
+# /statistics/app/connected_total endpoint is always used for that.
+STATUS_LINK_KEYS = ("rsl_in_dbm", "rsl_out_dbm")
 
 # ---------- HELPERS ----------
-def run_coap(cmd):
-    """Run a CoAP command and return stdout as string."""
+async def fetch_coap(ctx, path, payload=b""):
+    """GET a CoAP resource on the node and return its raw payload bytes."""
+    msg = aiocoap.Message(
+        code=aiocoap.GET, uri=f"coap://{NODE_ADDR}:{COAP_PORT}/{path}", payload=payload
+    )
     try:
-        result = subprocess.run(
-            cmd, shell=True, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE
-        )
-        return result.stdout.decode().strip()
-    except subprocess.CalledProcessError as e:
-        print(f"[ERROR] Command failed: {e}")
-        return ""
-
-def time_to_minutes(timestr):
-    """Convert Wi-SUN time format like '0-00:18:09' to total minutes."""
-    m = re.match(r"(\d+)-(\d+):(\d+):(\d+)", timestr.strip())
+        resp = await ctx.request(msg).response
+        return resp.payload
+    except Exception as e:
+        print(f"[ERROR] CoAP request to /{path} failed: {e}")
+        return b""
+
+def next_backoff(delay):
+    """Double a retry delay after a failure, capped at MAX_BACKOFF."""
+    return min(delay * 2, MAX_BACKOFF)
+
+def dhms_to_minutes(days, hours, mins, secs):
+    """Convert an already parsed days/hours/minutes/seconds duration to minutes."""
+    return days * 1440 + hours * 60 + mins + secs / 60.0
+
+def time_to_minutes(payload):
+    """Convert Wi-SUN time format like b'0-00:18:09' to total minutes."""
+    m = TIME_RE.match(payload)
     if not m:
         return 0.0
-    days, hours, mins, secs = map(int, m.groups())
-    total_mins = days * 24 * 60 + hours * 60 + mins + secs / 60.0
-    return round(total_mins, 2)
+    return round(dhms_to_minutes(*map(int, m.groups())), 2)
 
 def parse_neighbor_status(text):
-    """Parse neighbor status text for rsl_in, rsl_out, and rpl_rank."""
+    """Parse neighbor status payload for rsl_in, rsl_out, and rpl_rank."""
     try:
-        rsl_in = int(re.search(r'"rsl_in":\s*(-?\d+)', text).group(1))
-        rsl_out = int(re.search(r'"rsl_out":\s*(-?\d+)', text).group(1))
-        rpl_rank = int(re.search(r'"rpl_rank":\s*(\d+)', text).group(1))
-        return rsl_in, rsl_out, rpl_rank
+        fields = dict(NEIGHBOR_FIELD_RE.findall(text))
+        return int(fields[b"rsl_in"]), int(fields[b"rsl_out"]), int(fields[b"rpl_rank"])
     except Exception as e:
         print(f"[ERROR] Failed to parse neighbor data: {e}")
         return 0, 0, 0
 
 def extract_json_block(text):
-    """Extract JSON object from text that may contain non-JSON lines."""
-    start = text.find("{")
-    end = text.rfind("}") + 1
+    """Extract JSON object from a payload that may contain non-JSON lines."""
+    start = text.find(b"{")
+    end = text.rfind(b"}") + 1
     if start == -1 or end == 0:
         return None
     try:
-        return json.loads(text[start:end])
+        return json_loads(text[start:end])
     except Exception as e:
         print(f"[ERROR] JSON extraction failed: {e}")
         return None
 
 # ---------- MAIN LOOP ----------
-while True:
+async def main():
+    ctx = await aiocoap.Context.create_client_context()
+    # The node and ThingSpeak fail independently, so each backs off on its
+    # own and the loop waits for the longer of the two
+    coap_delay = http_delay = UPDATE_INTERVAL
     try:
-        print("\n==============================")
-        print("📡 Collecting Wi-SUN node data...")
-        print("==============================")
-
-        # ---------- 1. Sensor data ----------
-        sensor_cmd = f"aiocoap-client coap://{NODE_ADDR}:{COAP_PORT}/sensor/si7021"
-        sensor_out = run_coap(sensor_cmd)
-        sensor_json = extract_json_block(sensor_out)
-
-        if sensor_json:
-            temperature = sensor_json.get("temperature_mc", 0) / 1000.0
-            humidity = sensor_json.get("humidity_mrh", 0) / 1000.0
-        else:
-            print("[ERROR] Could not parse sensor JSON.")
-            temperature = humidity = 0.0
-
-        # ---------- 2. Disconnected total ----------
-        disc_cmd = f"aiocoap-client coap://{NODE_ADDR}:{COAP_PORT}/statistics/app/disconnected_total"
-        disc_out = run_coap(disc_cmd)
-        disconnected_total = time_to_minutes(disc_out.split("\n")[-1])
-
-        # ---------- 3. Connected total ----------
-        conn_cmd = f"aiocoap-client coap://{NODE_ADDR}:{COAP_PORT}/statistics/app/connected_total"
-        conn_out = run_coap(conn_cmd)
-        connected_total = time_to_minutes(conn_out.split("\n")[-1])
-
-        # ---------- 4. Neighbor status ----------
-        neighbor_cmd = f"aiocoap-client coap://{NODE_ADDR}:{COAP_PORT}/status/neighbor --payload 0"
-        neighbor_out = run_coap(neighbor_cmd)
-        rsl_in, rsl_out, rpl_rank = parse_neighbor_status(neighbor_out)
-
-        # ---------- 5. Hopcount ----------
-        status_cmd = f"aiocoap-client coap://{NODE_ADDR}:{COAP_PORT}/status/all"
-        status_out = run_coap(status_cmd)
-        status_json = extract_json_block(status_out)
-
-        if status_json:
-            hopcount = int(status_json.get("hopcount", 0))
-        else:
-            print("[ERROR] Could not parse hopcount JSON.")
-            hopcount = 0
-
-        # ---------- Print gathered data ----------
-        print("\nCollected Data:")
-        print(f"Temperature (°C): {temperature}")
-        print(f"Humidity (%): {humidity}")
-        print(f"Disconnected Total (min): {disconnected_total}")
-        print(f"RSL In (dBm): {rsl_in}")
-        print(f"RSL Out (dBm): {rsl_out}")
-        print(f"RPL Rank: {rpl_rank}")
-        print(f"Hopcount: {hopcount}")
-        print(f"Connected Total (min): {connected_total}")
-
-        # ---------- 6. Send to ThingSpeak ----------
-        # Order: temperature, humidity, disconnected_total, rsl_in, rsl_out, rpl_rank, hopcount, connected_total
-        url = "https://api.thingspeak.com/update"
-        payload = {
-            "api_key": THINGSPEAK_API_KEY,
-            "field1": temperature,
-            "field2": humidity,
-            "field3": disconnected_total,
-            "field4": rsl_in,
-            "field5": rsl_out,
-            "field6": rpl_rank,
-            "field7": hopcount,
-            "field8": connected_total,
-        }
-
-        resp = requests.post(url, data=payload, timeout=10)
-        if resp.status_code == 200 and resp.text.strip() != "0":
-            print(f"\n✅ Successfully sent to ThingSpeak (entry ID: {resp.text.strip()})")
-        else:
-            print(f"\n⚠ Failed to send to ThingSpeak: {resp.text} (status: {resp.status_code})")
-
-    except Exception as e:
-        print(f"[ERROR] Unexpected error: {e}")
-
-    # ---------- Delay before next update ----------
-    print(f"\n⏳ Waiting {UPDATE_INTERVAL} seconds before next update...\n")
-    time.sleep(UPDATE_INTERVAL)
+        while True:
+            try:
+                print("\n==============================")
+                print("📡 Collecting Wi-SUN node data...")
+                print("==============================")
+
+                # The requests share one context and overlap on the wire
+                sensor_out, conn_out, status_out = await asyncio.gather(
+                    fetch_coap(ctx, "sensor/si7021"),
+                    fetch_coap(ctx, "statistics/app/connected_total"),
+                    fetch_coap(ctx, "status/all"),
+                )
+                status_json = extract_json_block(status_out)
+
+                if sensor_out or conn_out or status_out:
+                    coap_delay = UPDATE_INTERVAL
+                else:
+                    print("[ERROR] Node did not answer any CoAP request.")
+                    coap_delay = next_backoff(coap_delay)
+
+                # ---------- 1. Sensor data ----------
+                sensor_json = extract_json_block(sensor_out)
+
+                if sensor_json:
+                    temperature = sensor_json.get("temperature_mc", 0) / 1000.0
+                    humidity = sensor_json.get("humidity_mrh", 0) / 1000.0
+                else:
+                    print("[ERROR] Could not parse sensor JSON.")
+                    temperature = humidity = 0.0
+
+                # ---------- 2. Disconnected total ----------
+                if status_json and status_json.get("disconnected_total"):
+                    disconnected_total = time_to_minutes(status_json["disconnected_total"].encode())
+                else:
+                    disc_out = await fetch_coap(ctx, "statistics/app/disconnected_total")
+                    disconnected_total = time_to_minutes(disc_out)
+
+                # ---------- 3. Connected total ----------
+                connected_total = time_to_minutes(conn_out)
+
+                # ---------- 4. Neighbor status ----------
+                # /status/all clamps an unknown rank (0xFFFF) to 0 rather than
+                # leaving it out, and no joined node has rank 0, so a zero
+                # rank means /status/neighbor has to supply the real value
+                if (status_json
+                        and all(status_json.get(k) is not None for k in STATUS_LINK_KEYS)
+                        and int(status_json.get("rpl_rank") or 0) > 0):
+                    rsl_in = int(status_json["rsl_in_dbm"])
+                    rsl_out = int(status_json["rsl_out_dbm"])
+                    rpl_rank = int(status_json["rpl_rank"])
+                else:
+                    neighbor_out = await fetch_coap(ctx, "status/neighbor", payload=b"0")
+                    rsl_in, rsl_out, rpl_rank = parse_neighbor_status(neighbor_out)
+
+                # ---------- 5. Hopcount ----------
+                if status_json:
+                    hopcount = int(status_json.get("hopcount", 0))
+                else:
+                    print("[ERROR] Could not parse hopcount JSON.")
+                    hopcount = 0
+
+                # ---------- Print gathered data ----------
+                print("\nCollected Data:")
+                print(f"Temperature (°C): {temperature}")
+                print(f"Humidity (%): {humidity}")
+                print(f"Disconnected Total (min): {disconnected_total}")
+                print(f"RSL In (dBm): {rsl_in}")
+                print(f"RSL Out (dBm): {rsl_out}")
+                print(f"RPL Rank: {rpl_rank}")
+                print(f"Hopcount: {hopcount}")
+                print(f"Connected Total (min): {connected_total}")
+
+                # ---------- 6. Send to ThingSpeak ----------
+                # Order: temperature, humidity, disconnected_total, rsl_in, rsl_out, rpl_rank, hopcount, connected_total
+                payload = {
+                    "api_key": THINGSPEAK_API_KEY,
+                    "field1": temperature,
+                    "field2": humidity,
+                    "field3": disconnected_total,
+                    "field4": rsl_in,
+                    "field5": rsl_out,
+                    "field6": rpl_rank,
+                    "field7": hopcount,
+                    "field8": connected_total,
+                }
+
+                THINGSPEAK_REQUEST.prepare_body(payload, None)
+                resp = SESSION.send(THINGSPEAK_REQUEST, timeout=10, **THINGSPEAK_SEND_SETTINGS)
+                if resp.status_code == 200 and resp.text.strip() != "0":
+                    print(f"\n✅ Successfully sent to ThingSpeak (entry ID: {resp.text.strip()})")
+                    http_delay = UPDATE_INTERVAL
+                else:
+                    print(f"\n⚠ Failed to send to ThingSpeak: {resp.text} (status: {resp.status_code})")
+                    http_delay = next_backoff(http_delay)
+
+            except requests.RequestException as e:
+                print(f"[ERROR] ThingSpeak upload failed: {e}")
+                http_delay = next_backoff(http_delay)
+            except Exception as e:
+                print(f"[ERROR] Unexpected error: {e}")
+                coap_delay = next_backoff(coap_delay)
+
+            # ---------- Delay before next update ----------
+            delay = max(coap_delay, http_delay)
+            print(f"\n⏳ Waiting {delay} seconds before next update...\n")
+            await asyncio.sleep(delay)
+    finally:
+        await ctx.shutdown()
+        SESSION.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
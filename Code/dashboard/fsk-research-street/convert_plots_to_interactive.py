@@ -6,33 +6,64 @@ Uses actual Wi-SUN network data from CSV files.
 
 import plotly.graph_objects as go
 import plotly.express as px
+import plotly.io as pio
 import numpy as np
 import pandas as pd
+import concurrent.futures
 import glob
+import math
 import os
 
+# Serialize figures with orjson when it is installed; the stdlib json
+# encoder dominates write_html for the larger traces
+try:
+    import orjson  # noqa: F401
+    pio.json.config.default_engine = "orjson"
+except ImportError:
+    pass
+
 # Load the actual data
 data_path = "../ESW_WiSun/data/"
 files = glob.glob(data_path + "*.csv")
 
-if not files:
-    print("⚠️  No data files found. Using sample data instead.")
-    USE_REAL_DATA = False
-else:
-    print(f"📂 Found {len(files)} data files")
-    USE_REAL_DATA = True
-    
-    # Load and combine all CSV files
-    dfs = []
-    for f in files:
-        name = os.path.basename(f).split(".")[0]
-        temp = pd.read_csv(f)
-        temp["location"] = name
-        dfs.append(temp)
-    
-    df = pd.concat(dfs, ignore_index=True)
-    df["created_at"] = pd.to_datetime(df["created_at"])
-    
+# Only these feed columns are plotted; the parser skips entry_id and the
+# connected/disconnected totals entirely
+USECOLS = ["created_at", "Temperature", "Humidity", "RSL_in", "RSL_out", "RPL_rank", "Hopcount"]
+
+# Column types of the columns read, narrowed to what the sensor and link
+# values need so the wide defaults are never materialized; the link columns
+# stay float so a blank cell reads as NaN instead of failing the parse
+DTYPES = {
+    "Temperature": "float32",
+    "Humidity": "float32",
+    "RSL_in": "float32",
+    "RSL_out": "float32",
+    "RPL_rank": "float32",
+    "Hopcount": "float32",
+}
+
+# Parsed frame is cached next to the CSVs and reused until they change
+CACHE_FILE = os.path.join(data_path, "data_cache.parquet")
+# Stored in the cache's metadata; bump it whenever the loader changes the frame
+CACHE_VERSION = 2
+
+def read_location_csv(f):
+    """Parse one location CSV, tagged with its location name"""
+    # Column types and the ThingSpeak ISO 8601 timestamp format are declared
+    # up front so pandas does not infer them
+    return (
+        pd.read_csv(f, usecols=USECOLS, dtype=DTYPES, parse_dates=["created_at"],
+                    date_format="ISO8601", engine="c")
+        .assign(location=os.path.basename(f).split(".")[0])
+    )
+
+def load_csv_data(files):
+    """Parse the CSV files into one DataFrame with location distances"""
+    # The C parser releases the GIL, so the files are read side by side;
+    # map() keeps them in file order for the single concat
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(files), os.cpu_count() or 1)) as ex:
+        df = pd.concat(ex.map(read_location_csv, files), ignore_index=True)
+
     # Assign coordinates
     coords = {
         "location1": (120, 220),
@@ -40,50 +71,107 @@ else:
         "location3": (450, 400),
         "location4": (200, 480)
     }
-    df["x"] = df["location"].map(lambda l: coords.get(l, (0, 0))[0])
-    df["y"] = df["location"].map(lambda l: coords.get(l, (0, 0))[1])
+    # Only a handful of distinct locations, so keep them as categorical codes
+    df["location"] = df["location"].astype("category")
     
-    # Calculate distance from root node
+    # Calculate distance from root node once per location, not per row
     x_root, y_root = 100, 150
-    df["distance_px"] = np.sqrt((df.x - x_root)**2 + (df.y - y_root)**2)
-    df["distance_m"] = df["distance_px"] * 0.5  # Approximate pixel to meter conversion
+    def distance_m(x, y):
+        return math.hypot(x - x_root, y - y_root) * 0.5  # Approximate pixel to meter conversion
+    dist_map = {loc: distance_m(x, y) for loc, (x, y) in coords.items()}
+    df["distance_m"] = df["location"].map(dist_map).fillna(distance_m(0, 0)).astype("float32")
     
-    print(f"✅ Loaded {len(df)} total samples from {len(files)} locations")
+    return df
+
+def read_cached_data(files):
+    """Return the cached DataFrame if it is newer than every CSV, else None"""
+    if not os.path.exists(CACHE_FILE):
+        return None
+    if os.path.getmtime(CACHE_FILE) <= max(os.path.getmtime(f) for f in files):
+        return None
+    try:
+        df = pd.read_parquet(CACHE_FILE)
+    except Exception as e:
+        print(f"⚠️  Ignoring unreadable cache {CACHE_FILE}: {e}")
+        return None
+    if df.attrs.get("cache_version") != CACHE_VERSION:
+        print(f"⚠️  Ignoring {CACHE_FILE} written by an older loader")
+        return None
+    # A removed CSV does not bump any mtime, so also check the location set
+    names = {os.path.basename(f).split(".")[0] for f in files}
+    if set(df["location"].unique()) != names:
+        return None
+    print(f"⚡ Using cached data from {CACHE_FILE}")
+    return df
+
+def write_cached_data(df):
+    """Save the parsed DataFrame as Parquet; skipped if no engine is installed"""
+    df.attrs["cache_version"] = CACHE_VERSION
+    try:
+        df.to_parquet(CACHE_FILE, compression="zstd", index=False)
+    except ImportError:
+        pass
+
+if not files:
+    print("⚠️  No data files found. Using sample data instead.")
+    USE_REAL_DATA = False
+else:
+    print(f"📂 Found {len(files)} data files")
+    USE_REAL_DATA = True
+    
+    df = read_cached_data(files)
+    if df is None:
+        df = load_csv_data(files)
+        write_cached_data(df)
+    
+    if df.empty:
+        # Header-only exports leave nothing to aggregate or correlate
+        print("⚠️  Data files contain no samples. Using sample data instead.")
+        USE_REAL_DATA = False
+    else:
+        print(f"✅ Loaded {len(df)} total samples from {len(files)} locations")
+
+def write_figure(fig, output_file):
+    """Write a figure as standalone HTML that pulls plotly.js from the CDN"""
+    # Inlining plotly.js would add ~3 MB of identical script to every file
+    fig.write_html(output_file, include_plotlyjs="cdn", full_html=True,
+                   config={"responsive": True}, validate=False)
+    print(f"✓ Created {output_file}")
 
 def create_pathloss_plot(output_file):
     """Pathloss Fit plot using real Wi-SUN data"""
     if USE_REAL_DATA:
-        # Group by location and get mean values
-        summary = df.groupby("location").agg({
-            "distance_m": "first",
-            "RSL_out": "mean"
-        }).reset_index()
-        
-        # Create scatter plot with individual measurements
-        fig = go.Figure()
-        
-        # Add scatter plot for all measurements
-        fig.add_trace(go.Scatter(
-            x=df["distance_m"], 
-            y=df["RSL_out"], 
-            mode='markers',
-            name='Measured RSL',
-            marker=dict(color='#667eea', size=6, opacity=0.6),
-            text=df['location'],
-            hovertemplate='<b>%{text}</b><br>Distance: %{x:.1f}m<br>RSL: %{y:.1f} dBm<extra></extra>'
-        ))
-        
-        # Add mean values per location
-        fig.add_trace(go.Scatter(
-            x=summary["distance_m"], 
-            y=summary["RSL_out"],
-            mode='markers+text',
-            name='Mean per Location',
-            marker=dict(color='#f56565', size=12, symbol='diamond'),
-            text=summary['location'],
-            textposition="top center",
-            hovertemplate='<b>%{text}</b><br>Distance: %{x:.1f}m<br>Mean RSL: %{y:.1f} dBm<extra></extra>'
-        ))
+        # Group by location and get mean values in one named aggregation
+        summary = df.groupby("location", observed=True).agg(
+            distance_m=("distance_m", "first"),
+            RSL_out=("RSL_out", "mean"),
+        ).reset_index()
+        
+        # Build both traces up front and hand them to the figure in one go;
+        # the per-measurement trace uses WebGL since it grows with the data
+        fig = go.Figure(data=[
+            # Scatter plot for all measurements
+            go.Scattergl(
+                x=df["distance_m"].to_numpy(),
+                y=df["RSL_out"].to_numpy(),
+                mode='markers',
+                name='Measured RSL',
+                marker=dict(color='#667eea', size=6, opacity=0.6),
+                text=df['location'].to_numpy(),
+                hovertemplate='<b>%{text}</b><br>Distance: %{x:.1f}m<br>RSL: %{y:.1f} dBm<extra></extra>'
+            ),
+            # Mean values per location
+            go.Scatter(
+                x=summary["distance_m"].to_numpy(),
+                y=summary["RSL_out"].to_numpy(),
+                mode='markers+text',
+                name='Mean per Location',
+                marker=dict(color='#f56565', size=12, symbol='diamond'),
+                text=summary['location'].to_numpy(),
+                textposition="top center",
+                hovertemplate='<b>%{text}</b><br>Distance: %{x:.1f}m<br>Mean RSL: %{y:.1f} dBm<extra></extra>'
+            ),
+        ])
         
         fig.update_layout(
             title='Path Loss: RSL vs Distance from Root Node',
@@ -115,8 +203,7 @@ def create_pathloss_plot(output_file):
             height=500
         )
     
-    fig.write_html(output_file)
-    print(f"✓ Created {output_file}")
+    write_figure(fig, output_file)
 
 def create_rsl_profile_plot(output_file):
     """RSL 1D Profile plot using real data"""
@@ -128,11 +215,10 @@ def create_rsl_profile_plot(output_file):
         fig = go.Figure()
         
         # Plot RSL_out and RSL_in for each location
-        for location in df_sorted['location'].unique():
-            loc_data = df_sorted[df_sorted['location'] == location]
+        for location, loc_data in df_sorted.groupby('location', sort=False, observed=True):
             fig.add_trace(go.Scatter(
-                x=loc_data['time_min'],
-                y=loc_data['RSL_out'],
+                x=loc_data['time_min'].to_numpy(),
+                y=loc_data['RSL_out'].to_numpy(),
                 mode='lines+markers',
                 name=f'{location} (out)',
                 line=dict(width=2),
@@ -166,29 +252,27 @@ def create_rsl_profile_plot(output_file):
             height=500
         )
     
-    fig.write_html(output_file)
-    print(f"✓ Created {output_file}")
+    write_figure(fig, output_file)
 
 def create_humidity_rsl_plot(output_file):
     """Humidity vs RSL scatter plot using real data"""
     if USE_REAL_DATA:
-        fig = go.Figure()
-        
         # Color code by location
         colors = {'location1': '#667eea', 'location2': '#48bb78', 
                   'location3': '#ed8936', 'location4': '#f56565'}
         
-        for location in df['location'].unique():
-            loc_data = df[df['location'] == location]
-            fig.add_trace(go.Scatter(
-                x=loc_data['Humidity'],
-                y=loc_data['RSL_out'],
+        traces = []
+        for location, loc_data in df.groupby('location', sort=False, observed=True):
+            traces.append(go.Scattergl(
+                x=loc_data['Humidity'].to_numpy(),
+                y=loc_data['RSL_out'].to_numpy(),
                 mode='markers',
                 name=location,
                 marker=dict(color=colors.get(location, '#667eea'), size=8),
                 hovertemplate='<b>%{text}</b><br>Humidity: %{x:.1f}%<br>RSL: %{y:.1f} dBm<extra></extra>',
                 text=[location] * len(loc_data)
             ))
+        fig = go.Figure(data=traces)
         
         fig.update_layout(
             title='Humidity vs. RSL (Outbound)',
@@ -217,23 +301,28 @@ def create_humidity_rsl_plot(output_file):
             height=500
         )
     
-    fig.write_html(output_file)
-    print(f"✓ Created {output_file}")
+    write_figure(fig, output_file)
 
 def create_correlation_matrix_plot(output_file):
     """Environmental Correlation Matrix heatmap using real data"""
     if USE_REAL_DATA:
         # Calculate correlation matrix for environmental and signal parameters
         corr_vars = ["Temperature", "Humidity", "RSL_in", "RSL_out"]
-        corr_matrix = df[corr_vars].corr()
+        # The columns are float32 already, so this is one contiguous block;
+        # pandas' pairwise path is only needed when there are gaps
+        values = df[corr_vars].to_numpy(dtype=np.float32)
+        if np.isnan(values).any():
+            corr_matrix = df[corr_vars].corr().to_numpy()
+        else:
+            corr_matrix = np.corrcoef(values, rowvar=False)
         
         fig = go.Figure(data=go.Heatmap(
-            z=corr_matrix.values,
+            z=corr_matrix,
             x=corr_vars,
             y=corr_vars,
             colorscale='RdBu',
             zmid=0,
-            text=np.around(corr_matrix.values, decimals=2),
+            text=np.around(corr_matrix, decimals=2),
             texttemplate='%{text}',
             textfont={"size": 12},
             colorbar=dict(title='Correlation')
@@ -270,29 +359,27 @@ def create_correlation_matrix_plot(output_file):
             xaxis={'side': 'bottom'}
         )
     
-    fig.write_html(output_file)
-    print(f"✓ Created {output_file}")
+    write_figure(fig, output_file)
 
 def create_hopcount_rpl_plot(output_file):
     """Hopcount vs RPL Rank plot using real data"""
     if USE_REAL_DATA:
-        fig = go.Figure()
-        
         # Color code by location
         colors = {'location1': '#667eea', 'location2': '#48bb78', 
                   'location3': '#ed8936', 'location4': '#f56565'}
         
-        for location in df['location'].unique():
-            loc_data = df[df['location'] == location]
-            fig.add_trace(go.Scatter(
-                x=loc_data['Hopcount'],
-                y=loc_data['RPL_rank'],
+        traces = []
+        for location, loc_data in df.groupby('location', sort=False, observed=True):
+            traces.append(go.Scattergl(
+                x=loc_data['Hopcount'].to_numpy(),
+                y=loc_data['RPL_rank'].to_numpy(),
                 mode='markers',
                 name=location,
                 marker=dict(color=colors.get(location, '#ed8936'), size=8),
                 hovertemplate='<b>%{text}</b><br>Hopcount: %{x}<br>RPL Rank: %{y}<extra></extra>',
                 text=[location] * len(loc_data)
             ))
+        fig = go.Figure(data=traces)
         
         fig.update_layout(
             title='Hopcount vs. RPL Rank',
@@ -321,8 +408,7 @@ def create_hopcount_rpl_plot(output_file):
             height=500
         )
     
-    fig.write_html(output_file)
-    print(f"✓ Created {output_file}")
+    write_figure(fig, output_file)
 
 def create_temperature_anomaly_plot(output_file):
     """Temperature Anomaly time series using real data"""
@@ -339,11 +425,10 @@ def create_temperature_anomaly_plot(output_file):
         colors = {'location1': '#f56565', 'location2': '#48bb78', 
                   'location3': '#ed8936', 'location4': '#667eea'}
         
-        for location in df_sorted['location'].unique():
-            loc_data = df_sorted[df_sorted['location'] == location]
+        for location, loc_data in df_sorted.groupby('location', sort=False, observed=True):
             fig.add_trace(go.Scatter(
                 x=loc_data['created_at'],
-                y=loc_data['Temperature'],
+                y=loc_data['Temperature'].to_numpy(),
                 mode='lines+markers',
                 name=location,
                 line=dict(color=colors.get(location, '#f56565'), width=2),
@@ -353,7 +438,7 @@ def create_temperature_anomaly_plot(output_file):
         # Add baseline
         fig.add_trace(go.Scatter(
             x=df_sorted['created_at'],
-            y=[baseline]*len(df_sorted),
+            y=np.full(len(df_sorted), baseline),
             mode='lines',
             name=f'Baseline ({baseline:.1f}°C)',
             line=dict(color='gray', dash='dash', width=2)
@@ -389,29 +474,27 @@ def create_temperature_anomaly_plot(output_file):
             height=500
         )
     
-    fig.write_html(output_file)
-    print(f"✓ Created {output_file}")
+    write_figure(fig, output_file)
 
 def create_time_position_heatmap(output_file):
     """Time Position Heatmap using real data"""
     if USE_REAL_DATA:
-        # Extract hour from timestamp
-        df['hour'] = df['created_at'].dt.hour
-        df['minute_bucket'] = (df['created_at'].dt.minute // 5) * 5  # 5-minute buckets
-        df['time_label'] = df['created_at'].dt.strftime('%H:%M')
-        
-        # Create pivot table for heatmap
-        # Use RSL_out as the value to display
-        pivot_data = df.pivot_table(
-            values='RSL_out',
-            index='location',
-            columns='time_label',
-            aggfunc='mean'
+        # Bucket by minute of day as a plain integer; only the distinct
+        # buckets are formatted as 'HH:MM' labels, not every row
+        minute_of_day = (df['created_at'].dt.hour * 60 + df['created_at'].dt.minute).rename('time_label')
+        
+        # Mean RSL_out per (location, minute) cell; groupby + unstack skips
+        # the extra dispatch layer pivot_table adds on top of the same work
+        pivot_data = (
+            df.groupby(['location', minute_of_day], observed=True)['RSL_out']
+            .mean()
+            .unstack('time_label')
         )
+        time_labels = [f"{m // 60:02d}:{m % 60:02d}" for m in pivot_data.columns]
         
         fig = go.Figure(data=go.Heatmap(
             z=pivot_data.values,
-            x=pivot_data.columns,
+            x=time_labels,
             y=pivot_data.index,
             colorscale='Viridis',
             colorbar=dict(title='RSL (dBm)'),
@@ -448,8 +531,7 @@ def create_time_position_heatmap(output_file):
             height=500
         )
     
-    fig.write_html(output_file)
-    print(f"✓ Created {output_file}")
+    write_figure(fig, output_file)
 
 
 def main():
@@ -464,13 +546,22 @@ def main():
         print("⚠️  Using sample data (real data files not found)")
     print("=" * 60)
     
-    create_pathloss_plot("pathloss_fit_meters.html")
-    create_rsl_profile_plot("rsl_1d_profile_meters.html")
-    create_humidity_rsl_plot("humidity_vs_rsl.html")
-    create_correlation_matrix_plot("env_corr_matrix.html")
-    create_hopcount_rpl_plot("hopcount_rpl_rank.html")
-    create_temperature_anomaly_plot("temperature_anomaly.html")
-    create_time_position_heatmap("time_position_heatmap.html")
+    plots = [
+        (create_pathloss_plot, "pathloss_fit_meters.html"),
+        (create_rsl_profile_plot, "rsl_1d_profile_meters.html"),
+        (create_humidity_rsl_plot, "humidity_vs_rsl.html"),
+        (create_correlation_matrix_plot, "env_corr_matrix.html"),
+        (create_hopcount_rpl_plot, "hopcount_rpl_rank.html"),
+        (create_temperature_anomaly_plot, "temperature_anomaly.html"),
+        (create_time_position_heatmap, "time_position_heatmap.html"),
+    ]
+    
+    # The plots only read the shared df, so they can be built and written
+    # side by side; result() re-raises any error from a worker
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(plots), os.cpu_count() or 1)) as ex:
+        futures = [ex.submit(fn, out) for fn, out in plots]
+        for f in futures:
+            f.result()
     
     print("=" * 60)
     print("\n✅ All interactive plots created!")
@@ -2,6 +2,8 @@
 import os
 import re
 import glob
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
 import numpy as np
@@ -9,6 +11,13 @@ import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+    import pyarrow.dataset as ds
+except ImportError:  # pyarrow is optional; CSVs are then read one by one
+    ds = None
+
 def load_theme():
     st.markdown("""
     <style>
@@ -131,71 +140,164 @@ def load_theme():
 # CONFIG
 # -----------------------------
 TOTAL_LOCATIONS = 20         # 20 points along research street (every 10m)
+CACHE_DIR = "cache"          # on-disk copies of the loaded frames, keyed by input files
+CACHE_VERSION = 2            # bump whenever the loader changes what ends up in the frame
+MAX_SCATTER_POINTS = 8000    # rows sent to the browser for the RSL scatter
+
+# ThingSpeak field -> common column name, in the order the node uploads them
+OFDM_FIELDS = {
+    "field1": "Temperature",
+    "field2": "Humidity",
+    "field3": "DisconnectedTotal",
+    "field4": "RSL_out",
+    "field5": "RSL_in",
+    "field6": "RPL_rank",
+    "field7": "Hopcount",
+    "field8": "ConnectedTotal",
+}
+OFDM_COLUMNS = ["created_at", *OFDM_FIELDS]
+OFDM_DTYPES = {f: "float32" for f in OFDM_FIELDS}
+
+# Column layout shared by every loaded frame, so concat just stacks blocks
+SCHEMA = ["created_at", *OFDM_FIELDS.values(), "modulation", "location_id"]
+
+# Sensor readings and durations (minutes) fit in float32; hop counts are
+# small non-negative integers
+FLOAT_COLUMNS = ("Temperature", "Humidity", "RSL_out", "RSL_in", "DisconnectedTotal", "ConnectedTotal")
+COUNT_COLUMNS = ("Hopcount",)
+RPL_RANK_NO_ROUTE = 65000    # ranks this high (0xFFFF) mean "no route", not a real cost
+
+# Fixed categories so frames from different files concat without falling
+# back to object strings
+MODULATION_DTYPE = pd.CategoricalDtype(["FSK", "OFDM"])
 
 
 # -----------------------------
 # DATA LOADING HELPERS
 # -----------------------------
+OFDM_LOC_RE = re.compile(r"\((\d+)\)")        # 'feeds (10).xlsx' -> '10'
+FSK_LOC_RE = re.compile(r"Location (\d+)")     # 'Location 20.xlsx' -> '20'
+
+
 def parse_location_from_feeds(filename: str) -> str:
     """
     For OFDM files like 'feeds (10).xlsx', returns '10'.
     If no number in the name (e.g., 'feeds.csv'), returns 'base'.
     """
     base = os.path.basename(filename)
-    m = re.search(r"\((\d+)\)", base)
+    m = OFDM_LOC_RE.search(base)
     if m:
         return m.group(1)
     return "base"
 
 
-def load_ofdm_file(path: str) -> pd.DataFrame:
-    """Load one OFDM file and map ThingSpeak fields to common columns."""
-    if path.lower().endswith(".csv"):
-        df = pd.read_csv(path)
-    else:
-        df = pd.read_excel(path)
+def read_excel_cached(path: str, **read_kwargs) -> pd.DataFrame:
+    """
+    Read an Excel sheet through a '<file>.parquet' sidecar next to it.
+    The sidecar is rewritten whenever the workbook is newer, so edits to
+    the .xlsx are still picked up; parsing the xlsx XML only happens then.
+    read_kwargs go to pd.read_excel, and the sidecar stores that result.
+    """
+    pq = path + ".parquet"
+    if os.path.exists(pq) and os.path.getmtime(pq) >= os.path.getmtime(path):
+        try:
+            return pd.read_parquet(pq)
+        except Exception:
+            pass  # unreadable sidecar or no parquet engine: re-read the sheet
+
+    df = pd.read_excel(path, engine="openpyxl", **read_kwargs)
+    try:
+        df.to_parquet(pq, compression="zstd", index=False)
+    except (ImportError, OSError):
+        pass  # no parquet engine or read-only data dir: just skip the cache
+    return df
 
+
+def downcast_metrics(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Shrink the metric columns to the narrowest dtype that holds them and
+    parse the ThingSpeak timestamps once, as UTC datetimes.
+    """
+    df["created_at"] = pd.to_datetime(df["created_at"], utc=True, format="ISO8601", errors="coerce")
+    for c in FLOAT_COLUMNS:
+        df[c] = pd.to_numeric(df[c], errors="coerce", downcast="float")
+    for c in COUNT_COLUMNS:
+        df[c] = pd.to_numeric(df[c], errors="coerce", downcast="unsigned")
+
+    # Blank out the no-route sentinel once here instead of on every rerun
+    rank = pd.to_numeric(df["RPL_rank"], errors="coerce").to_numpy(dtype=np.float32, copy=True)
+    rank[rank >= RPL_RANK_NO_ROUTE] = np.nan
+    df["RPL_rank"] = rank
+    return df
+
+
+def standardize_ofdm(df: pd.DataFrame, path: str) -> pd.DataFrame:
+    """Map one OFDM file's ThingSpeak fields to the common columns."""
     # Drop first row if it's all zeros in field columns (startup junk)
+    # (checked on the float32 values directly, without a fillna copy)
     field_cols = [c for c in df.columns if c.startswith("field")]
-    if len(df) > 0 and not df[field_cols].isna().all(axis=None):
-        first_sum = df[field_cols].fillna(0).iloc[0].sum()
-        if first_sum == 0:
-            df = df.iloc[1:].reset_index(drop=True)
+    vals = df[field_cols].to_numpy(dtype=np.float32)
+    if len(vals) > 0 and not np.isnan(vals).all() and np.nansum(vals[0]) == 0:
+        df = df.iloc[1:].reset_index(drop=True)
 
     loc = parse_location_from_feeds(path)
 
     # Map fields to the same schema as FSK
-    df_std = pd.DataFrame({
-        "created_at": df["created_at"],
-        "Temperature": df.get("field1"),
-        "Humidity": df.get("field2"),
-        "DisconnectedTotal": df.get("field3"),
-        "RSL_out": df.get("field4"),
-        "RSL_in": df.get("field5"),
-        "RPL_rank": df.get("field6"),
-        "Hopcount": df.get("field7"),
-        "ConnectedTotal": df.get("field8"),
-    })
-
-    df_std["modulation"] = "OFDM"
+    df_std = df.rename(columns=OFDM_FIELDS)
+
+    df_std["modulation"] = pd.Series("OFDM", index=df_std.index, dtype=MODULATION_DTYPE)
     df_std["location_id"] = loc
-    return df_std
+    # Missing fields come back empty
+    return downcast_metrics(df_std.reindex(columns=SCHEMA))
+
+
+def load_ofdm_file(path: str) -> pd.DataFrame:
+    """Load one OFDM file and map ThingSpeak fields to common columns."""
+    # Only parse the timestamp and the eight fields, with their types given
+    read_kwargs = dict(usecols=lambda c: c in OFDM_COLUMNS, dtype=OFDM_DTYPES)
+    if path.lower().endswith(".csv"):
+        df = pd.read_csv(path, **read_kwargs)
+    else:
+        df = read_excel_cached(path, **read_kwargs)
+    return standardize_ofdm(df, path)
+
+
+def load_ofdm_csvs(paths: list) -> list:
+    """
+    Load several OFDM CSV exports with one pyarrow dataset scan, then
+    split them back into per-file frames (the startup-row check and the
+    location id are per file). Falls back to load_ofdm_file without pyarrow.
+    """
+    if ds is None or not paths:
+        return [load_ofdm_file(p) for p in paths]
+
+    column_types = {f: pa.float32() for f in OFDM_FIELDS}
+    column_types["created_at"] = pa.string()
+    fmt = ds.CsvFileFormat(convert_options=pacsv.ConvertOptions(column_types=column_types))
+    df = ds.dataset(paths, format=fmt).to_table(columns=OFDM_COLUMNS + ["__filename"]).to_pandas()
+
+    by_file = dict(tuple(df.groupby("__filename", sort=False)))
+    return [
+        standardize_ofdm(by_file[p].drop(columns="__filename").reset_index(drop=True), p)
+        if p in by_file else load_ofdm_file(p)
+        for p in paths
+    ]
 
 
 def load_fsk_file(path: str) -> pd.DataFrame:
     """Load one FSK file (Location 1/2/3/20.xlsx)."""
-    df = pd.read_excel(path)
+    df = read_excel_cached(path)
     base = os.path.basename(path)
-    m = re.search(r"Location (\d+)", base)
+    m = FSK_LOC_RE.search(base)
     loc = m.group(1) if m else base
 
-    df["modulation"] = "FSK"
+    df["modulation"] = pd.Series("FSK", index=df.index, dtype=MODULATION_DTYPE)
     df["location_id"] = loc
-    return df
+    return downcast_metrics(df.reindex(columns=SCHEMA))
 
 
-@st.cache_data(show_spinner=True)
-def load_all_data():
+def load_frames():
+    """Load every OFDM and FSK sample into one frame, via the on-disk cache if current."""
     # Collect file lists
     ofdm_paths = sorted(glob.glob("data/feeds*.xlsx") + glob.glob("data/feeds*.csv"))
     fsk_paths = sorted(glob.glob("data/Location *.xlsx"))
@@ -205,23 +307,223 @@ def load_all_data():
     if not fsk_paths:
         st.warning("No FSK files found matching 'Location *.xlsx'.")
 
-    ofdm_list = [load_ofdm_file(p) for p in ofdm_paths]
-    fsk_list = [load_fsk_file(p) for p in fsk_paths]
+    # Fingerprint every input file so any edit, addition or removal misses;
+    # the loader version and schema go in too, so a frame written by older
+    # loading code is never served
+    fingerprint = hashlib.blake2b(repr((CACHE_VERSION, SCHEMA, sorted(
+        (p, os.path.getmtime(p), os.path.getsize(p)) for p in ofdm_paths + fsk_paths
+    ))).encode()).hexdigest()[:16]
+    cache_path = os.path.join(CACHE_DIR, f"{fingerprint}_combined.parquet")
+    if os.path.exists(cache_path):
+        try:
+            return pd.read_parquet(cache_path)
+        except Exception:
+            pass  # unreadable cache or no parquet engine: rebuild below
+
+    # Files are independent, so parse them side by side (much of the
+    # zip/XML and CSV work happens outside the GIL); all OFDM CSVs go
+    # through a single dataset scan
+    csv_paths = [p for p in ofdm_paths if p.lower().endswith(".csv")]
+    xlsx_paths = [p for p in ofdm_paths if p not in csv_paths]
+    n_files = len(ofdm_paths) + len(fsk_paths)
+    with ThreadPoolExecutor(max_workers=max(1, min(8, n_files))) as ex:
+        csv_result = ex.submit(load_ofdm_csvs, csv_paths)
+        xlsx_results = ex.map(load_ofdm_file, xlsx_paths)
+        fsk_results = ex.map(load_fsk_file, fsk_paths)
+        ofdm_by_path = dict(zip(xlsx_paths, xlsx_results))
+        ofdm_by_path.update(zip(csv_paths, csv_result.result()))
+        fsk_list = list(fsk_results)
+    frames = [ofdm_by_path[p] for p in ofdm_paths] + fsk_list
+
+    # A single frame for both modulations; per-modulation views are masks
+    combined = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    if combined.empty:
+        return combined
+
+    # Location ids differ per file, so categorize them once all are known
+    combined["location_id"] = combined["location_id"].astype("category")
 
-    ofdm = pd.concat(ofdm_list, ignore_index=True) if ofdm_list else pd.DataFrame()
-    fsk = pd.concat(fsk_list, ignore_index=True) if fsk_list else pd.DataFrame()
+    # Create numeric location index for plotting on 1D street
+    # (one vectorized regex pass; ids without a number, like 'base', become NaN)
+    combined["loc_num"] = pd.to_numeric(
+        combined["location_id"].astype(str).str.extract(r"(\d+)", expand=False),
+        errors="coerce",
+    )
 
-    # Combine for global plots
-    combined = pd.concat([ofdm, fsk], ignore_index=True)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        combined.to_parquet(cache_path, compression="zstd", index=False)
+        # Older fingerprints can never match again, so drop their files
+        for old in glob.glob(os.path.join(CACHE_DIR, "*_combined.parquet")):
+            if old != cache_path:
+                os.remove(old)
+    except (ImportError, OSError):
+        pass  # no parquet engine or read-only checkout: keep the RAM cache only
 
-    # Create numeric location index for plotting on 1D street
-    def to_loc_num(x):
-        m = re.search(r"(\d+)", str(x))
-        return float(m.group(1)) if m else np.nan
+    return combined
+
+
+# cache_resource hands every rerun the same frames without a pickle round
+# trip; the app only reads them, so nothing below may modify them in place
+@st.cache_resource(show_spinner=True)
+def load_all_data():
+    combined = load_frames()
+
+    # Per-location means for every modulation in one pass; the summary
+    # tables slice their rows out of this
+    if combined.empty:
+        per_loc = pd.DataFrame()
+    else:
+        per_loc = (
+            combined.groupby(["modulation", "location_id"], observed=True)
+            [["RSL_out", "RSL_in", "RPL_rank", "Hopcount"]]
+            .mean()
+            .astype("float64")
+            .round(2)
+        )
+
+    return combined, per_loc
+
+
+# -----------------------------
+# PLOT HELPERS
+# -----------------------------
+# The figure builders below are keyed on small, already reduced inputs, so
+# a rerun with unchanged data reuses the built figure instead of redoing it.
+
+@st.cache_data(show_spinner=False)
+def make_coverage_fig(loc_nums: tuple, loc_ids: tuple, fsk_connected: tuple) -> go.Figure:
+    """Two-row OFDM/FSK connectivity strip along the street."""
+    # Hover labels built column-wise; location ids are the index as text
+    loc_label = "Location " + pd.Series(loc_ids, dtype=str)
+    ofdm_hover = (loc_label + " – OFDM: connected").tolist()
+    fsk_state = np.where(np.array(fsk_connected, dtype=bool), "connected", "no data")
+    fsk_hover = (loc_label + " – FSK: " + fsk_state).tolist()
+
+    x = np.asarray(loc_nums)
+    fig = go.Figure()
+
+    # OFDM coverage
+    fig.add_trace(
+        go.Scatter(
+            x=x,
+            y=[1] * len(x),
+            mode="markers",
+            marker=dict(size=12),
+            name="OFDM",
+            marker_symbol="circle",
+            hovertext=ofdm_hover,
+        )
+    )
+
+    # FSK coverage
+    fig.add_trace(
+        go.Scatter(
+            x=x,
+            y=[0] * len(x),
+            mode="markers",
+            marker=dict(size=12),
+            name="FSK",
+            marker_symbol="x",
+            hovertext=fsk_hover,
+        )
+    )
+
+    fig.update_layout(
+        xaxis_title="Location index along street (1 = start, 20 = end)",
+        yaxis=dict(
+            tickvals=[0, 1],
+            ticktext=["FSK", "OFDM"],
+            title="Modulation",
+        ),
+        height=300,
+        showlegend=True,
+    )
+    return fig
+
+
+def box_stats(df: pd.DataFrame, col: str) -> tuple:
+    """
+    Per-modulation (name, q1, median, q3, lower, upper) for one column,
+    with Tukey (1.5 IQR) whiskers, so only these reach the browser
+    instead of every raw sample.
+    """
+    stats = []
+    for mod, vals in df.groupby("modulation", sort=False, observed=True)[col]:
+        x = vals.dropna().to_numpy()
+        if x.size == 0:
+            continue
+        q1, med, q3 = np.percentile(x, [25, 50, 75])
+        iqr = q3 - q1
+        lo = x[x >= q1 - 1.5 * iqr].min()
+        hi = x[x <= q3 + 1.5 * iqr].max()
+        stats.append((mod, *(float(v) for v in (q1, med, q3, lo, hi))))
+    return tuple(stats)
+
+
+@st.cache_data(show_spinner=False)
+def make_box_fig(stats: tuple, title: str, yaxis_title: str) -> go.Figure:
+    """Box plot per modulation from precomputed box_stats()."""
+    fig = go.Figure()
+    for mod, q1, med, q3, lo, hi in stats:
+        fig.add_trace(go.Box(
+            name=mod,
+            x=[mod],
+            q1=[q1],
+            median=[med],
+            q3=[q3],
+            lowerfence=[lo],
+            upperfence=[hi],
+        ))
+    fig.update_layout(
+        title=title,
+        xaxis_title="modulation",
+        yaxis_title=yaxis_title,
+        legend_title_text="modulation",
+        boxmode="overlay",
+    )
+    return fig
+
+
+@st.cache_data(show_spinner=False)
+def make_rsl_scatter_fig(scatter_df: pd.DataFrame) -> go.Figure:
+    """
+    RSL_in vs RSL_out, coloured by modulation. One WebGL trace per
+    modulation, in order of appearance so the colours match px.scatter.
+    """
+    fig = go.Figure()
+    for mod, grp in scatter_df.groupby("modulation", sort=False, observed=True):
+        fig.add_trace(go.Scattergl(
+            x=grp["RSL_out"].to_numpy(),
+            y=grp["RSL_in"].to_numpy(),
+            mode="markers",
+            name=mod,
+            legendgroup=mod,
+            marker=dict(opacity=0.6),
+            hovertemplate=f"modulation={mod}<br>RSL_out=%{{x}}<br>RSL_in=%{{y}}<extra></extra>",
+        ))
+    fig.update_layout(
+        title="RSL_in vs RSL_out by Modulation",
+        xaxis_title="RSL_out (dBm)",
+        yaxis_title="RSL_in (dBm)",
+        legend_title_text="modulation",
+    )
+    return fig
 
-    combined["loc_num"] = combined["location_id"].apply(to_loc_num)
 
-    return ofdm, fsk, combined
+@st.cache_data(show_spinner=False)
+def make_mesh_bar_fig(modulations: tuple, values: tuple, col: str, title: str, yaxis_title: str) -> go.Figure:
+    """Bar of one averaged mesh metric per modulation, labelled with its value."""
+    fig = px.bar(
+        pd.DataFrame({"modulation": modulations, col: values}),
+        x="modulation",
+        y=col,
+        title=title,
+        text=col,
+    )
+    fig.update_traces(textposition="outside")
+    fig.update_layout(yaxis_title=yaxis_title)
+    return fig
 
 
 # -----------------------------
@@ -249,7 +551,7 @@ It highlights:
 """
 )
 
-ofdm, fsk, combined = load_all_data()
+combined, per_loc = load_all_data()
 if combined.empty:
     st.stop()
 
@@ -257,13 +559,24 @@ if combined.empty:
 # KPIs
 # -----------------------------
 ofdm_locs = TOTAL_LOCATIONS
-fsk_locs = fsk["location_id"].nunique()
+# Locations with FSK data are exactly the FSK rows of per_loc, so no
+# further pass over the samples is needed to count or flag them
+fsk_loc_ids = per_loc.loc["FSK"].index if "FSK" in per_loc.index else pd.Index([])
+fsk_locs = len(fsk_loc_ids)
+
+# Every per-modulation mean in one pass; reused by the mesh section below
+kpi = (
+    combined.groupby("modulation", observed=True)[["RSL_in", "Hopcount", "RPL_rank"]]
+    .mean()
+    .reindex(MODULATION_DTYPE.categories)
+    .rename_axis("modulation")
+)
 
-avg_rsl_in_ofdm = ofdm["RSL_in"].mean()
-avg_rsl_in_fsk = fsk["RSL_in"].mean()
+avg_rsl_in_ofdm = kpi.loc["OFDM", "RSL_in"]
+avg_rsl_in_fsk = kpi.loc["FSK", "RSL_in"]
 
-avg_hop_ofdm = ofdm["Hopcount"].mean()
-avg_hop_fsk = fsk["Hopcount"].mean()
+avg_hop_ofdm = kpi.loc["OFDM", "Hopcount"]
+avg_hop_fsk = kpi.loc["FSK", "Hopcount"]
 
 col1, col2, col3, col4 = st.columns(4)
 
@@ -303,61 +616,19 @@ st.subheader("1. Coverage Along Research Street (20 Points Every 10m)")
 loc_df = pd.DataFrame({"loc_num": np.arange(1, TOTAL_LOCATIONS + 1)})
 loc_df["location_id"] = loc_df["loc_num"].astype(int).astype(str)
 
-# Connectivity flags
-ofdm_loc_presence = ofdm.groupby("location_id").size().rename("ofdm_present")
-fsk_loc_presence = fsk.groupby("location_id").size().rename("fsk_present")
-
-loc_cov = loc_df.merge(ofdm_loc_presence, on="location_id", how="left")
-loc_cov = loc_cov.merge(fsk_loc_presence, on="location_id", how="left")
-
-loc_cov["ofdm_connected"] = True
-loc_cov["fsk_connected"] = loc_cov["fsk_present"].notna()
-
-fig_cov = go.Figure()
-
-# OFDM coverage
-fig_cov.add_trace(
-    go.Scatter(
-        x=loc_cov["loc_num"],
-        y=[1] * len(loc_cov),
-        mode="markers",
-        marker=dict(size=12),
-        name="OFDM",
-        marker_symbol="circle",
-        hovertext=[
-            f"Location {int(l)} – OFDM: connected"
-            for l in loc_cov["loc_num"]
-        ],
-    )
-)
+# Connectivity flags (a location is connected if it produced any rows)
+fsk_locs_set = set(fsk_loc_ids)
 
-# FSK coverage
-fig_cov.add_trace(
-    go.Scatter(
-        x=loc_cov["loc_num"],
-        y=[0] * len(loc_cov),
-        mode="markers",
-        marker=dict(size=12),
-        name="FSK",
-        marker_symbol="x",
-        hovertext=[
-            f"Location {int(l)} – FSK: {'connected' if c else 'no data'}"
-            for l, c in zip(loc_cov["loc_num"], loc_cov["fsk_connected"])
-        ],
-    )
+loc_cov = loc_df.assign(
+    ofdm_connected=True,
+    fsk_connected=loc_df["location_id"].isin(fsk_locs_set),
 )
 
-fig_cov.update_layout(
-    xaxis_title="Location index along street (1 = start, 20 = end)",
-    yaxis=dict(
-        tickvals=[0, 1],
-        ticktext=["FSK", "OFDM"],
-        title="Modulation",
-    ),
-    height=300,
-    showlegend=True,
+fig_cov = make_coverage_fig(
+    tuple(loc_cov["loc_num"].tolist()),
+    tuple(loc_cov["location_id"].tolist()),
+    tuple(loc_cov["fsk_connected"].tolist()),
 )
-
 st.plotly_chart(fig_cov, use_container_width=True)
 
 st.markdown(
@@ -379,25 +650,15 @@ st.subheader("2. Link Quality – RSL_in and RSL_out")
 col_rsl1, col_rsl2 = st.columns(2)
 
 with col_rsl1:
-    fig_rsl_in = px.box(
-        combined,
-        x="modulation",
-        y="RSL_in",
-        color="modulation",
-        title="RSL_in Distribution by Modulation",
+    fig_rsl_in = make_box_fig(
+        box_stats(combined, "RSL_in"), "RSL_in Distribution by Modulation", "RSL_in (dBm)"
     )
-    fig_rsl_in.update_layout(yaxis_title="RSL_in (dBm)")
     st.plotly_chart(fig_rsl_in, use_container_width=True)
 
 with col_rsl2:
-    fig_rsl_out = px.box(
-        combined,
-        x="modulation",
-        y="RSL_out",
-        color="modulation",
-        title="RSL_out Distribution by Modulation",
+    fig_rsl_out = make_box_fig(
+        box_stats(combined, "RSL_out"), "RSL_out Distribution by Modulation", "RSL_out (dBm)"
     )
-    fig_rsl_out.update_layout(yaxis_title="RSL_out (dBm)")
     st.plotly_chart(fig_rsl_out, use_container_width=True)
 
 st.markdown(
@@ -410,19 +671,13 @@ st.markdown(
 """
 )
 
-# Scatter plot: RSL_in vs RSL_out
-fig_scatter = px.scatter(
-    combined,
-    x="RSL_out",
-    y="RSL_in",
-    color="modulation",
-    title="RSL_in vs RSL_out by Modulation",
-    opacity=0.6,
-)
-fig_scatter.update_layout(
-    xaxis_title="RSL_out (dBm)",
-    yaxis_title="RSL_in (dBm)",
-)
+# Scatter plot: RSL_in vs RSL_out (a fixed random sample once the data
+# outgrows what the browser renders smoothly)
+if len(combined) > MAX_SCATTER_POINTS:
+    scatter_df = combined.sample(MAX_SCATTER_POINTS, random_state=0)
+else:
+    scatter_df = combined
+fig_scatter = make_rsl_scatter_fig(scatter_df[["RSL_out", "RSL_in", "modulation"]])
 st.plotly_chart(fig_scatter, use_container_width=True)
 
 st.markdown("---")
@@ -433,7 +688,6 @@ st.markdown("---")
 # MESH BEHAVIOUR – HOPCOUNT & RPL RANK
 # -----------------------------
 st.subheader("3. Mesh Behaviour – Hopcount and RPL Rank")
-combined["RPL_rank_clean"] = combined["RPL_rank"].mask(combined["RPL_rank"] >= 65000, np.nan)
 
 # group_stats = (
 #     combined.groupby("modulation")[["Hopcount", "RPL_rank"]]
@@ -443,9 +697,9 @@ combined["RPL_rank_clean"] = combined["RPL_rank"].mask(combined["RPL_rank"] >= 6
 # )
 
 group_stats = (
-    combined.groupby("modulation")[["Hopcount", "RPL_rank_clean"]]
-    .mean()
-    .rename(columns={"RPL_rank_clean": "RPL_rank"})
+    kpi[["Hopcount", "RPL_rank"]]
+    .dropna(how="all")
+    .astype("float64")
     .reset_index()
     .round(2)
 )
@@ -453,27 +707,23 @@ group_stats = (
 col_mesh1, col_mesh2 = st.columns(2)
 
 with col_mesh1:
-    fig_hop = px.bar(
-        group_stats,
-        x="modulation",
-        y="Hopcount",
-        title="Average Hopcount by Modulation",
-        text="Hopcount",
+    fig_hop = make_mesh_bar_fig(
+        tuple(group_stats["modulation"].tolist()),
+        tuple(group_stats["Hopcount"].tolist()),
+        "Hopcount",
+        "Average Hopcount by Modulation",
+        "Average hopcount",
     )
-    fig_hop.update_traces(textposition="outside")
-    fig_hop.update_layout(yaxis_title="Average hopcount")
     st.plotly_chart(fig_hop, use_container_width=True)
 
 with col_mesh2:
-    fig_rank = px.bar(
-        group_stats,
-        x="modulation",
-        y="RPL_rank",
-        title="Average RPL Rank by Modulation",
-        text="RPL_rank",
+    fig_rank = make_mesh_bar_fig(
+        tuple(group_stats["modulation"].tolist()),
+        tuple(group_stats["RPL_rank"].tolist()),
+        "RPL_rank",
+        "Average RPL Rank by Modulation",
+        "Average RPL Rank (routing cost)",
     )
-    fig_rank.update_traces(textposition="outside")
-    fig_rank.update_layout(yaxis_title="Average RPL Rank (routing cost)")
     st.plotly_chart(fig_rank, use_container_width=True)
 
 st.markdown(
@@ -495,24 +745,14 @@ st.markdown("---")
 st.subheader("4. Per-Location Summary (Only Where FSK Has Data)")
 
 # FSK location stats
-if not fsk.empty:
-    fsk_loc_summary = (
-        fsk.groupby("location_id")[["RSL_out", "RSL_in", "RPL_rank", "Hopcount"]]
-        .mean()
-        .round(2)
-        .reset_index()
-    )
+if "FSK" in per_loc.index:
+    fsk_loc_summary = per_loc.xs("FSK").reset_index()
 
     st.markdown("**FSK locations (1, 2, 3, 20):**")
     st.dataframe(fsk_loc_summary, use_container_width=True)
 
     # Compare with OFDM at same location_ids (if present)
-    ofdm_loc_summary = (
-        ofdm.groupby("location_id")[["RSL_out", "RSL_in", "Hopcount"]]
-        .mean()
-        .round(2)
-        .reset_index()
-    )
+    ofdm_loc_summary = per_loc.xs("OFDM")[["RSL_out", "RSL_in", "Hopcount"]].reset_index()
 
     merged_loc = fsk_loc_summary.merge(
         ofdm_loc_summary,